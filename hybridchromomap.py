@@ -9,17 +9,33 @@ and variable ploidy levels.
 
 from __future__ import annotations
 
+import hashlib
+import mmap
+import multiprocessing
+import os
+import pickle
+import re
+import stat
 import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
+from functools import cached_property, partial
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import (
+    IO, TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+)
 
 import click
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-import matplotlib.colors as mcolors
-from matplotlib.patches import FancyBboxPatch, Rectangle
-from matplotlib.collections import PatchCollection
+import numpy as np
+
+# matplotlib is imported where it is used, so `--help` and argument errors
+# do not pay for loading it
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as mpatches
+    from matplotlib.path import Path as MplPath
+    from matplotlib.transforms import Bbox
 
 
 # =============================================================================
@@ -32,11 +48,22 @@ class Origin:
     name: str
     color: str  # Hex color like #E63946
     label: str  # Display label for legend
+    _rgb_cache: Optional[Tuple[str, Tuple[float, float, float]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def to_rgb(self) -> Tuple[float, float, float]:
-        """Convert hex color to RGB tuple (0-1 range)."""
-        hex_color = self.color.lstrip('#')
-        return tuple(int(hex_color[i:i+2], 16) / 255.0 for i in (0, 2, 4))
+        """Convert hex color to RGB tuple (0-1 range). Cached per color value."""
+        if self._rgb_cache is None or self._rgb_cache[0] != self.color:
+            if _HEX_COLOR_RE.match(self.color):
+                # One int parse, channels extracted with shifts
+                v = int(self.color[1:], 16)
+                rgb = (((v >> 16) & 0xFF) / 255.0, ((v >> 8) & 0xFF) / 255.0, (v & 0xFF) / 255.0)
+            else:
+                import matplotlib.colors as mcolors
+                rgb = mcolors.to_rgb(self.color)
+            self._rgb_cache = (self.color, rgb)
+        return self._rgb_cache[1]
 
 
 @dataclass
@@ -76,20 +103,87 @@ class Annotation:
         return self.end > self.start
 
 
+@dataclass
+class OriginTable:
+    """Interns origin names to small integer ids shared by all chromosome copies."""
+    names: List[str] = field(default_factory=list)
+    ids: Dict[str, int] = field(default_factory=dict)
+
+    def intern(self, name: str) -> int:
+        """Return the id for an origin name, adding it if new."""
+        if name not in self.ids:
+            self.ids[name] = len(self.names)
+            self.names.append(name)
+        return self.ids[name]
+
+    def intern_many(self, names: Sequence[str]) -> np.ndarray:
+        """Return int32 ids for a sequence of origin names."""
+        uniq, inverse = np.unique(np.asarray(names, dtype=str), return_inverse=True)
+        lookup = np.array([self.intern(n) for n in uniq.tolist()], dtype=np.int32)
+        return lookup[inverse.reshape(-1)]
+
+    def used_names(self, ids: np.ndarray) -> List[str]:
+        """Return the sorted unique names referenced by an id array."""
+        counts = np.bincount(ids, minlength=len(self.names))
+        return sorted(self.names[i] for i in np.flatnonzero(counts).tolist())
+
+
+def _empty_ints(dtype=np.int64) -> np.ndarray:
+    return np.empty(0, dtype=dtype)
+
+
 @dataclass
 class ChromosomeCopy:
-    """Represents one copy of a chromosome."""
+    """
+    Represents one copy of a chromosome.
+    Segments are stored as parallel arrays (start, end, origin id).
+    """
     chrom: str
     copy: int
     length: int
-    segments: List[Segment] = field(default_factory=list)
+    origin_table: OriginTable = field(default_factory=OriginTable, repr=False, compare=False)
+    starts: np.ndarray = field(default_factory=_empty_ints, repr=False, compare=False)
+    ends: np.ndarray = field(default_factory=_empty_ints, repr=False, compare=False)
+    origin_ids: np.ndarray = field(
+        default_factory=lambda: _empty_ints(np.int32), repr=False, compare=False
+    )
+
+    @property
+    def segments(self) -> List[Segment]:
+        """Segments as Segment objects, built from the arrays."""
+        names = self.origin_table.names
+        return [
+            Segment(chrom=self.chrom, copy=self.copy, start=start, end=end, origin=names[o])
+            for start, end, o in zip(
+                self.starts.tolist(), self.ends.tolist(), self.origin_ids.tolist()
+            )
+        ]
+
+    @property
+    def num_segments(self) -> int:
+        return len(self.starts)
 
     def add_segment(self, segment: Segment):
-        self.segments.append(segment)
+        self.add_segments(
+            [segment.start], [segment.end], [self.origin_table.intern(segment.origin)]
+        )
+
+    def add_segments(self, starts: np.ndarray, ends: np.ndarray, origin_ids: np.ndarray):
+        """Append segments in bulk; origin_ids index into origin_table."""
+        self.starts = np.concatenate([self.starts, np.asarray(starts, dtype=np.int64)])
+        self.ends = np.concatenate([self.ends, np.asarray(ends, dtype=np.int64)])
+        self.origin_ids = np.concatenate(
+            [self.origin_ids, np.asarray(origin_ids, dtype=np.int32)]
+        )
 
     def sort_segments(self):
-        """Sort segments by start position."""
-        self.segments.sort(key=lambda s: s.start)
+        """Sort segments by start position (stable; no-op if already sorted)."""
+        if np.all(self.starts[1:] >= self.starts[:-1]):
+            return
+        idx = np.argsort(self.starts, kind='stable')
+        self.starts = self.starts[idx]
+        self.ends = self.ends[idx]
+        self.origin_ids = self.origin_ids[idx]
 
 
 @dataclass
@@ -97,15 +191,18 @@ class Chromosome:
     """Represents a chromosome with potentially multiple copies."""
     name: str
     copies: Dict[int, ChromosomeCopy] = field(default_factory=dict)
+    origin_table: OriginTable = field(default_factory=OriginTable, repr=False, compare=False)
 
     def add_copy(self, copy_num: int, length: int):
         self.copies[copy_num] = ChromosomeCopy(
             chrom=self.name,
             copy=copy_num,
-            length=length
+            length=length,
+            origin_table=self.origin_table
         )
+        self.__dict__.pop('max_length', None)
 
-    @property
+    @cached_property
     def max_length(self) -> int:
         """Return the maximum length among all copies."""
         return max(c.length for c in self.copies.values()) if self.copies else 0
@@ -121,39 +218,225 @@ class Karyotype:
     """Manages all chromosome information."""
     chromosomes: Dict[str, Chromosome] = field(default_factory=dict)
     chrom_order: List[str] = field(default_factory=list)  # Preserve input order
+    origin_table: OriginTable = field(default_factory=OriginTable, repr=False, compare=False)
+    _order_cache: Dict[str, List[str]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
 
     def add_chromosome_copy(self, chrom_name: str, copy_num: int, length: int):
         if chrom_name not in self.chromosomes:
-            self.chromosomes[chrom_name] = Chromosome(name=chrom_name)
+            self.chromosomes[chrom_name] = Chromosome(
+                name=chrom_name, origin_table=self.origin_table
+            )
             self.chrom_order.append(chrom_name)
         self.chromosomes[chrom_name].add_copy(copy_num, length)
+        self._order_cache.clear()
+        self.__dict__.pop('max_length', None)
 
     def get_copy(self, chrom_name: str, copy_num: int) -> Optional[ChromosomeCopy]:
         if chrom_name in self.chromosomes:
             return self.chromosomes[chrom_name].copies.get(copy_num)
         return None
 
-    @property
+    @cached_property
     def max_length(self) -> int:
         """Return the maximum chromosome length across all chromosomes."""
         return max(c.max_length for c in self.chromosomes.values()) if self.chromosomes else 0
 
+    def all_origin_ids(self) -> np.ndarray:
+        """Return the origin ids of every segment, concatenated across all copies."""
+        arrays = [
+            copy.origin_ids
+            for chrom in self.chromosomes.values()
+            for copy in chrom.copies.values()
+        ]
+        return np.concatenate(arrays) if arrays else np.empty(0, dtype=np.int32)
+
+    def used_origins(self) -> List[str]:
+        """Return the sorted names of origins referenced by at least one segment."""
+        return self.origin_table.used_names(self.all_origin_ids())
+
     def get_ordered_chromosomes(self, sort_by: str = 'none') -> List[str]:
-        """Return chromosome names in specified order."""
-        if sort_by == 'name':
-            return sorted(self.chrom_order)
-        elif sort_by == 'length':
-            return sorted(self.chrom_order,
-                         key=lambda n: self.chromosomes[n].max_length,
-                         reverse=True)
-        else:  # 'none' - preserve input order
+        """Return chromosome names in specified order (cached per sort_by)."""
+        if sort_by not in ('name', 'length'):  # 'none' - preserve input order
             return self.chrom_order
 
+        order = self._order_cache.get(sort_by)
+        if order is None:
+            if sort_by == 'name':
+                keys = np.array(self.chrom_order, dtype=str)
+            else:
+                # Longest first; the stable sort keeps input order among ties
+                keys = -np.array(
+                    [self.chromosomes[n].max_length for n in self.chrom_order], dtype=np.int64
+                )
+            idx = np.argsort(keys, kind='stable')
+            order = [self.chrom_order[i] for i in idx.tolist()]
+            self._order_cache[sort_by] = order
+        return order
+
 
 # =============================================================================
 # File Parsers
 # =============================================================================
 
+def _read_text(filepath: Path) -> str:
+    """
+    Read a whole text file through a read-only memory map.
+    The kernel pages the file in on demand and the text is decoded straight
+    from the mapped pages, skipping the intermediate read buffer. Pipes and
+    other non-regular files (which report size 0) are read normally.
+    """
+    with open(filepath, 'rb') as f:
+        st = os.fstat(f.fileno())
+        if not stat.S_ISREG(st.st_mode):
+            return str(f.read(), 'utf-8')
+        if st.st_size == 0:
+            return ''
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return str(mm, 'utf-8')
+
+
+# Segment files are parsed in blocks of about this many bytes (see _read_chunks)
+_PARSE_CHUNK_BYTES = 1 << 20
+
+
+def _read_chunks(filepath: Path, chunk_bytes: int = _PARSE_CHUNK_BYTES) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (first_line_number, text) blocks of whole lines from a file.
+    Blocks are cut at the first newline after chunk_bytes, so only one
+    block is decoded and held as str at a time. Pipes and other
+    non-regular files are read in blocks cut at their last newline.
+    """
+    with open(filepath, 'rb') as f:
+        st = os.fstat(f.fileno())
+        if not stat.S_ISREG(st.st_mode):
+            line_num, rest = 1, b''
+            while True:
+                block = f.read(chunk_bytes)
+                if not block:
+                    break
+                cut = block.rfind(b'\n') + 1
+                if cut == 0:
+                    rest += block
+                    continue
+                text = str(rest + block[:cut], 'utf-8')
+                yield line_num, text
+                line_num += text.count('\n')
+                rest = block[cut:]
+            if rest:
+                yield line_num, str(rest, 'utf-8')
+            return
+        if st.st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos, line_num, size = 0, 1, len(mm)
+            while pos < size:
+                end = mm.find(b'\n', pos + chunk_bytes) if pos + chunk_bytes < size else -1
+                end = size if end == -1 else end + 1
+                text = str(mm[pos:end], 'utf-8')
+                yield line_num, text
+                line_num += text.count('\n')
+                pos = end
+
+
+def _table_rows(
+    text: str,
+    first_line: int,
+    min_cols: int,
+    file_desc: str,
+    columns: str
+) -> Tuple[List[int], List[List[str]]]:
+    """Split TSV text into rows; see _read_table."""
+    line_nums = []
+    rows = []
+
+    for line_num, line in enumerate(text.split('\n'), first_line):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+
+        parts = line.split('\t')
+        if len(parts) < min_cols:
+            raise ValueError(
+                f"{file_desc} file line {line_num}: expected {min_cols} columns "
+                f"({columns}), got {len(parts)}"
+            )
+        line_nums.append(line_num)
+        rows.append(parts)
+
+    return line_nums, rows
+
+
+def _table_columns(
+    text: str,
+    first_line: int,
+    num_cols: int,
+    file_desc: str,
+    columns: str
+) -> Tuple[List[int], List[Sequence[str]]]:
+    """Split TSV text into its first num_cols columns; see _read_columns."""
+    lines = list(map(str.strip, text.split('\n')))
+    line_nums = [
+        i for i, line in enumerate(lines, first_line) if line and line[0] != '#'
+    ]
+    body = [lines[i - first_line] for i in line_nums]
+
+    if all(line.count('\t') == num_cols - 1 for line in body):
+        fields = '\t'.join(body).split('\t') if body else []
+        return line_nums, [fields[i::num_cols] for i in range(num_cols)]
+
+    line_nums, rows = _table_rows(text, first_line, num_cols, file_desc, columns)
+    if not rows:
+        return line_nums, [[] for _ in range(num_cols)]
+    return line_nums, list(zip(*rows))[:num_cols]
+
+
+def _read_table(
+    filepath: Path,
+    min_cols: int,
+    file_desc: str,
+    columns: str
+) -> Tuple[List[int], List[List[str]]]:
+    """
+    Read a TSV file, skipping blank and comment lines.
+    Returns (line_numbers, rows) with every row having at least min_cols fields.
+    """
+    return _table_rows(_read_text(filepath), 1, min_cols, file_desc, columns)
+
+
+def _read_columns(
+    filepath: Path,
+    num_cols: int,
+    file_desc: str,
+    columns: str
+) -> Tuple[List[int], List[Sequence[str]]]:
+    """
+    Read the first num_cols columns of a TSV file, column by column.
+    When every data line has exactly num_cols fields the whole body is
+    tokenized with a single split; otherwise falls back to row splitting.
+    """
+    return _table_columns(_read_text(filepath), 1, num_cols, file_desc, columns)
+
+
+def _int_column(values: Sequence[str], line_nums: List[int], file_desc: str) -> np.ndarray:
+    """Convert a column of strings to an int64 array in a single batch."""
+    try:
+        return np.fromiter(map(int, values), dtype=np.int64, count=len(values))
+    except ValueError:
+        pass
+
+    # Slow path: locate the offending line for the error message
+    for line_num, value in zip(line_nums, values):
+        try:
+            int(value)
+        except ValueError as e:
+            raise ValueError(
+                f"{file_desc} file line {line_num}: invalid integer value: {e}"
+            )
+    return np.array([int(v) for v in values], dtype=np.int64)
+
+
 def parse_karyotype(filepath: Path) -> Karyotype:
     """
     Parse karyotype TSV file.
@@ -161,29 +444,17 @@ def parse_karyotype(filepath: Path) -> Karyotype:
     """
     karyotype = Karyotype()
 
-    with open(filepath, 'r') as f:
-        for line_num, line in enumerate(f, 1):
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
-
-            parts = line.split('\t')
-            if len(parts) < 3:
-                raise ValueError(
-                    f"Karyotype file line {line_num}: expected 3 columns "
-                    f"(chrom, length, copy), got {len(parts)}"
-                )
+    line_nums, (chroms, lengths, copies) = _read_columns(
+        filepath, 3, 'Karyotype', 'chrom, length, copy'
+    )
+    if not line_nums:
+        return karyotype
 
-            chrom = parts[0]
-            try:
-                length = int(parts[1])
-                copy = int(parts[2])
-            except ValueError as e:
-                raise ValueError(
-                    f"Karyotype file line {line_num}: invalid integer value: {e}"
-                )
+    lengths = _int_column(lengths, line_nums, 'Karyotype')
+    copies = _int_column(copies, line_nums, 'Karyotype')
 
-            karyotype.add_chromosome_copy(chrom, copy, length)
+    for chrom, length, copy in zip(chroms, lengths.tolist(), copies.tolist()):
+        karyotype.add_chromosome_copy(chrom, copy, length)
 
     return karyotype
 
@@ -193,44 +464,65 @@ def parse_segments(filepath: Path, karyotype: Karyotype) -> None:
     Parse segments TSV file and add segments to karyotype.
     Format: #chrom  copy  start  end  origin
     """
-    with open(filepath, 'r') as f:
-        for line_num, line in enumerate(f, 1):
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
+    # Convert each block to arrays right away, so peak memory holds the
+    # string fields of one block rather than of the whole file
+    chrom_index: Dict[str, int] = {}
+    parts = {
+        name: [] for name in ('line_nums', 'chroms', 'copies', 'starts', 'ends', 'origin_ids')
+    }
+    for first_line, text in _read_chunks(filepath):
+        line_nums, (chroms, copies, starts, ends, origins) = _table_columns(
+            text, first_line, 5, 'Segments', 'chrom, copy, start, end, origin'
+        )
+        if not line_nums:
+            continue
+        uniq, inverse = np.unique(np.asarray(chroms, dtype=str), return_inverse=True)
+        codes = [chrom_index.setdefault(c, len(chrom_index)) for c in uniq.tolist()]
+        parts['line_nums'].append(np.asarray(line_nums, dtype=np.int64))
+        parts['chroms'].append(np.asarray(codes, dtype=np.int64)[inverse.reshape(-1)])
+        parts['copies'].append(_int_column(copies, line_nums, 'Segments'))
+        parts['starts'].append(_int_column(starts, line_nums, 'Segments'))
+        parts['ends'].append(_int_column(ends, line_nums, 'Segments'))
+        parts['origin_ids'].append(karyotype.origin_table.intern_many(origins))
+
+    if not parts['line_nums']:
+        return
+    line_nums, chrom_codes, copies, starts, ends, origin_ids = (
+        np.concatenate(arrays) for arrays in parts.values()
+    )
+    del parts
+    chrom_names = list(chrom_index)
+
+    # Group rows by (chrom, copy) with a single stable sort
+    copy_span = int(copies.max() - copies.min()) + 1
+    keys = chrom_codes * copy_span + (copies - copies.min())
+    order = np.argsort(keys, kind='stable')
+    bounds = np.flatnonzero(np.diff(keys[order])) + 1
+    groups = sorted(np.split(order, bounds), key=lambda g: g[0])
+
+    touched = []
+    for group in groups:
+        first = int(group[0])
+        chrom = chrom_names[chrom_codes[first]]
+        copy = int(copies[first])
+
+        chrom_copy = karyotype.get_copy(chrom, copy)
+        if chrom_copy is None:
+            raise ValueError(
+                f"Segments file line {line_nums[first]}: chromosome '{chrom}' copy {copy} "
+                f"not found in karyotype"
+            )
 
-            parts = line.split('\t')
-            if len(parts) < 5:
-                raise ValueError(
-                    f"Segments file line {line_num}: expected 5 columns "
-                    f"(chrom, copy, start, end, origin), got {len(parts)}"
-                )
+        chrom_copy.add_segments(starts[group], ends[group], origin_ids[group])
+        touched.append(chrom_copy)
 
-            chrom = parts[0]
-            try:
-                copy = int(parts[1])
-                start = int(parts[2])
-                end = int(parts[3])
-            except ValueError as e:
-                raise ValueError(
-                    f"Segments file line {line_num}: invalid integer value: {e}"
-                )
-            origin = parts[4]
+    # Sort segments once for each copy that received new segments
+    for chrom_copy in touched:
+        chrom_copy.sort_segments()
 
-            segment = Segment(chrom=chrom, copy=copy, start=start, end=end, origin=origin)
 
-            chrom_copy = karyotype.get_copy(chrom, copy)
-            if chrom_copy is None:
-                raise ValueError(
-                    f"Segments file line {line_num}: chromosome '{chrom}' copy {copy} "
-                    f"not found in karyotype"
-                )
-            chrom_copy.add_segment(segment)
-
-    # Sort segments for each copy
-    for chrom in karyotype.chromosomes.values():
-        for copy in chrom.copies.values():
-            copy.sort_segments()
+_HEX_COLOR_RE = re.compile(r'^#[0-9A-Fa-f]{6}$')
+_RGB_STRIP_CHARS = str.maketrans('', '', '() ')
 
 
 def parse_color(color_str: str) -> str:
@@ -244,42 +536,26 @@ def parse_color(color_str: str) -> str:
     """
     color_str = color_str.strip()
 
-    # Format 1: Hex color (#RRGGBB or #RGB)
-    if color_str.startswith('#'):
-        hex_color = color_str[1:]
-        if len(hex_color) == 6:
-            # Validate hex characters
-            try:
-                int(hex_color, 16)
-                return color_str.upper()
-            except ValueError:
-                pass
-        elif len(hex_color) == 3:
-            # Short hex format #RGB -> #RRGGBB
-            try:
-                int(hex_color, 16)
-                return f"#{hex_color[0]*2}{hex_color[1]*2}{hex_color[2]*2}".upper()
-            except ValueError:
-                pass
+    # Format 1: Hex color (#RRGGBB), the common case
+    if _HEX_COLOR_RE.match(color_str):
+        return color_str.upper()
 
     # Format 2: RGB tuple - (R, G, B) or R,G,B
-    # Remove parentheses and split
-    rgb_str = color_str.strip('()').replace(' ', '')
-    if ',' in rgb_str:
-        parts = rgb_str.split(',')
+    if ',' in color_str:
+        parts = color_str.translate(_RGB_STRIP_CHARS).split(',')
         if len(parts) == 3:
             try:
                 r, g, b = [int(p) for p in parts]
-                if all(0 <= v <= 255 for v in (r, g, b)):
-                    return f"#{r:02X}{g:02X}{b:02X}"
             except ValueError:
                 pass
+            else:
+                if all(0 <= v <= 255 for v in (r, g, b)):
+                    return f"#{r:02X}{g:02X}{b:02X}"
 
-    # Format 3: Named color (matplotlib)
+    # Format 3: Short hex (#RGB) or named color (matplotlib)
+    import matplotlib.colors as mcolors
     try:
-        rgb = mcolors.to_rgb(color_str)
-        r, g, b = [int(v * 255) for v in rgb]
-        return f"#{r:02X}{g:02X}{b:02X}"
+        return mcolors.to_hex(mcolors.to_rgb(color_str)).upper()
     except ValueError:
         pass
 
@@ -333,17 +609,25 @@ def parse_origins(filepath: Path) -> Dict[str, Origin]:
 
 
 def validate_data(karyotype: Karyotype, origins: Dict[str, Origin]) -> List[str]:
-    """Validate that all segment origins exist in origins dict."""
-    errors = []
+    """
+    Validate that all segment origins exist in origins dict.
+    Returns one error per missing origin, naming the copies that use it.
+    """
+    missing = sorted(set(karyotype.used_origins()) - origins.keys())
 
-    for chrom in karyotype.chromosomes.values():
-        for copy in chrom.copies.values():
-            for segment in copy.segments:
-                if segment.origin not in origins:
-                    errors.append(
-                        f"Segment origin '{segment.origin}' for {segment.chrom} "
-                        f"copy {segment.copy} not found in origins file"
-                    )
+    errors = []
+    for name in missing:
+        origin_id = karyotype.origin_table.ids[name]
+        used_by = [
+            f"{copy.chrom} copy {copy.copy}"
+            for chrom in karyotype.chromosomes.values()
+            for copy in chrom.copies.values()
+            if (copy.origin_ids == origin_id).any()
+        ]
+        errors.append(
+            f"Segment origin '{name}' not found in origins file "
+            f"(used by {', '.join(used_by)})"
+        )
 
     return errors
 
@@ -368,11 +652,7 @@ def generate_origin_colors(karyotype: Karyotype) -> Dict[str, Origin]:
     ]
 
     # Collect all unique origins from segments
-    unique_origins = set()
-    for chrom in karyotype.chromosomes.values():
-        for copy in chrom.copies.values():
-            for segment in copy.segments:
-                unique_origins.add(segment.origin)
+    unique_origins = set(karyotype.used_origins())
 
     # Remove 'unknown' from the set if present (we'll add it separately)
     unique_origins.discard('unknown')
@@ -490,6 +770,256 @@ def parse_annotations(filepath: Path, karyotype: Karyotype) -> List[Annotation]:
     return annotations
 
 
+def load_inputs(
+    karyotype_path: Path,
+    segments_path: Path,
+    colors_path: Optional[Path] = None,
+    annotations_path: Optional[Path] = None,
+    echo: Optional[Callable[[str], Any]] = None
+) -> Tuple[Karyotype, Dict[str, Origin], List[Annotation]]:
+    """
+    Parse and validate all input files for one map.
+    Returns (karyotype, origins, annotations). Progress messages go to echo
+    if given. Raises ValueError if segment origins are missing from colors.
+    """
+    echo = echo or (lambda msg: None)
+
+    echo(f"Loading karyotype from {karyotype_path}...")
+    karyo = parse_karyotype(karyotype_path)
+
+    echo(f"Loading segments from {segments_path}...")
+    parse_segments(segments_path, karyo)
+
+    # Handle colors
+    if colors_path is not None:
+        echo(f"Loading colors from {colors_path}...")
+        origins = parse_origins(colors_path)
+
+        # Validate that segment origins match colors file
+        errors = validate_data(karyo, origins)
+        if errors:
+            raise ValueError(
+                "Validation errors:\n" + "\n".join(f"  - {e}" for e in errors)
+            )
+    else:
+        echo("No colors file provided, auto-generating colors for origins...")
+        # Generate colors based on unique origins in segments
+        origins = generate_origin_colors(karyo)
+
+    # Handle annotations
+    annotations = []
+    if annotations_path is not None:
+        echo(f"Loading annotations from {annotations_path}...")
+        annotations = parse_annotations(annotations_path, karyo)
+        echo(f"  Loaded {len(annotations)} annotations")
+
+    return karyo, origins, annotations
+
+
+# =============================================================================
+# Parsed Input Cache
+# =============================================================================
+
+# Bump when the pickled data model changes so stale entries are ignored
+_CACHE_VERSION = 1
+
+
+def _cache_dir() -> Path:
+    """Return the cache directory ($XDG_CACHE_HOME/hybridchromomap)."""
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'hybridchromomap'
+
+
+def _file_key(path: Optional[Path]) -> Optional[Tuple[str, int, int]]:
+    """Identify a file by (resolved path, mtime in ns, size)."""
+    if path is None:
+        return None
+    st = path.stat()
+    return str(path.resolve()), st.st_mtime_ns, st.st_size
+
+
+def load_inputs_cached(
+    karyotype_path: Path,
+    segments_path: Path,
+    colors_path: Optional[Path] = None,
+    annotations_path: Optional[Path] = None,
+    echo: Optional[Callable[[str], Any]] = None
+) -> Tuple[Karyotype, Dict[str, Origin], List[Annotation]]:
+    """
+    Same as load_inputs, but reuse a pickled result from the disk cache
+    while none of the input files has changed (by path, mtime and size).
+    Cache read/write failures are ignored and fall back to parsing, as do
+    inputs that are not regular files (pipes have no stable identity).
+    """
+    paths = (karyotype_path, segments_path, colors_path, annotations_path)
+    if not all(p is None or p.is_file() for p in paths):
+        return load_inputs(karyotype_path, segments_path, colors_path, annotations_path, echo)
+
+    key = (_CACHE_VERSION,) + tuple(_file_key(p) for p in paths)
+    cache_file = _cache_dir() / (hashlib.sha256(repr(key).encode()).hexdigest() + '.pkl')
+
+    try:
+        with open(cache_file, 'rb') as f:
+            result = pickle.load(f)
+        if echo:
+            echo(f"Loaded parsed inputs from cache {cache_file}")
+        return result
+    except Exception:
+        pass
+
+    result = load_inputs(karyotype_path, segments_path, colors_path, annotations_path, echo)
+
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass
+
+    return result
+
+
+# Unit half-circle from bottom to top, tabulated once for all capsule ends
+_ARC_POINTS = 16
+_ARC_THETA = np.linspace(-np.pi / 2, np.pi / 2, _ARC_POINTS)
+_ARC_COS = np.cos(_ARC_THETA)
+_ARC_SIN = np.sin(_ARC_THETA)
+
+def _capsule_vertices(
+    x0: np.ndarray,
+    x1: np.ndarray,
+    y: np.ndarray,
+    height: float,
+    clip_x0: Optional[np.ndarray] = None,
+    clip_x1: Optional[np.ndarray] = None,
+    out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Build polygon vertices for N capsules (bars with half-circle ends).
+    Returns an (N, 2 * _ARC_POINTS, 2) array: right cap bottom-to-top, then
+    left cap top-to-bottom. If clip_x0/clip_x1 are given, x coordinates are
+    clamped to that range, which yields exactly the part of each capsule
+    inside it; segments use this to follow the chromosome outline.
+    If out is given, vertices are written into it in place.
+    """
+    x0 = np.asarray(x0, dtype=float)
+    x1 = np.asarray(x1, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    n = _ARC_POINTS
+    if out is None:
+        out = np.empty((len(x0), 2 * n, 2))
+
+    half = height / 2
+    radius = np.minimum(half, (x1 - x0) / 2)[:, None]
+    center_y = (y + half)[:, None]
+
+    # x = x1 - r + r*cos on the right, x0 + r - r*cos on the left
+    np.multiply(radius, _ARC_COS - 1.0, out=out[:, :n, 0])
+    out[:, :n, 0] += x1[:, None]
+    np.multiply(radius, 1.0 - _ARC_COS, out=out[:, n:, 0])
+    out[:, n:, 0] += x0[:, None]
+
+    if clip_x0 is not None:
+        clip_x0 = np.asarray(clip_x0, dtype=float)[:, None]
+        np.maximum(out[:, :, 0], clip_x0, out=out[:, :, 0])
+    if clip_x1 is not None:
+        clip_x1 = np.asarray(clip_x1, dtype=float)[:, None]
+        np.minimum(out[:, :, 0], clip_x1, out=out[:, :, 0])
+
+    out[:, :n, 1] = half * _ARC_SIN
+    out[:, :n, 1] += center_y
+    out[:, n:, 1] = -half * _ARC_SIN
+    out[:, n:, 1] += center_y
+    return out
+
+
+def _rect_vertices(
+    x0: np.ndarray,
+    x1: np.ndarray,
+    y: np.ndarray,
+    height: float
+) -> np.ndarray:
+    """Build an (N, 4, 2) array of rectangle corners, counter-clockwise."""
+    verts = np.empty((len(x0), 4, 2))
+    verts[:, 0, 0] = verts[:, 3, 0] = x0
+    verts[:, 1, 0] = verts[:, 2, 0] = x1
+    verts[:, 0, 1] = verts[:, 1, 1] = y
+    verts[:, 2, 1] = verts[:, 3, 1] = y + height
+    return verts
+
+
+def _merge_runs(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    origin_ids: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Drop empty segments and merge runs of abutting same-origin segments.
+    Expects segments sorted by start; the drawn result is unchanged.
+    """
+    keep = ends > starts
+    if not keep.all():
+        starts, ends, origin_ids = starts[keep], ends[keep], origin_ids[keep]
+
+    # A segment continues the previous run if it starts where that one ends
+    continues = (starts[1:] == ends[:-1]) & (origin_ids[1:] == origin_ids[:-1])
+    if not continues.any():
+        return starts, ends, origin_ids
+
+    first = np.flatnonzero(np.concatenate(([True], ~continues)))
+    last = np.append(first[1:], len(starts)) - 1
+    return starts[first], ends[last], origin_ids[first]
+
+
+def _closed_polygon_codes(num_vertices: int) -> np.ndarray:
+    """Path codes for a polygon of num_vertices points plus its closing vertex."""
+    from matplotlib.path import Path as MplPath
+
+    codes = np.full(num_vertices + 1, MplPath.LINETO, dtype=MplPath.code_type)
+    codes[0] = MplPath.MOVETO
+    codes[-1] = MplPath.CLOSEPOLY
+    return codes
+
+
+def _compound_paths(
+    parts: Sequence[Tuple[np.ndarray, np.ndarray]]
+) -> Tuple[List[MplPath], np.ndarray]:
+    """
+    Join closed polygons that share an id into one compound Path per id.
+    parts holds (vertices (N, V, 2), ids (N,)) pairs; V may differ per pair.
+    Returns (paths, ids) with ids sorted ascending. Grouping discards the
+    input order, so the polygons must not overlap one another.
+    """
+    from matplotlib.path import Path as MplPath
+
+    uniq = np.unique(np.concatenate([ids for _, ids in parts]))
+    pieces = [([], []) for _ in range(len(uniq))]
+
+    for verts, ids in parts:
+        if not len(ids):
+            continue
+        codes = _closed_polygon_codes(verts.shape[1])
+
+        order = np.argsort(ids, kind='stable')
+        closed = np.concatenate([verts, verts[:, :1]], axis=1)[order]
+        sorted_ids = ids[order]
+        lo = np.searchsorted(sorted_ids, uniq, side='left')
+        hi = np.searchsorted(sorted_ids, uniq, side='right')
+        for (vert_list, code_list), a, b in zip(pieces, lo.tolist(), hi.tolist()):
+            if b > a:
+                vert_list.append(closed[a:b].reshape(-1, 2))
+                code_list.append(np.tile(codes, b - a))
+
+    paths = [
+        MplPath(np.concatenate(vert_list), np.concatenate(code_list))
+        for vert_list, code_list in pieces
+    ]
+    return paths, uniq
+
+
 # =============================================================================
 # Renderer
 # =============================================================================
@@ -514,6 +1044,7 @@ class ChromoMapRenderer:
         marker_size: float = 0.06,
         label_angle: float = 45.0,
         show_labels: bool = True,
+        rasterize_threshold: int = 5000,
     ):
         self.karyotype = karyotype
         self.origins = origins
@@ -530,12 +1061,19 @@ class ChromoMapRenderer:
         self.marker_size = marker_size
         self.label_angle = label_angle
         self.show_labels = show_labels
+        self.rasterize_threshold = rasterize_threshold
 
         # Calculate scale: bp to inches
         self.max_bp = karyotype.max_length
         self.plot_width = fig_width - left_margin - right_margin
         self.bp_to_inch = self.plot_width / self.max_bp if self.max_bp > 0 else 1
 
+        # Dense RGBA palette indexed by origin id (see _origin_rgba_table)
+        self._palette = np.empty((0, 4), dtype=np.float32)
+
+        # Legend handles and labels keyed by origin names (see _legend_entries)
+        self._legend_cache: Dict[Tuple[str, ...], Tuple[List[mpatches.Patch], List[str]]] = {}
+
     def _get_annotation_height(self, chrom_name: str, copy_num: int) -> float:
         """Calculate extra height needed for annotations on a chromosome copy."""
         if not self.annotations:
@@ -584,104 +1122,21 @@ class ChromoMapRenderer:
 
         return total_height
 
-    def _draw_capsule(
-        self,
-        ax: plt.Axes,
-        x: float,
-        y: float,
-        width: float,
-        height: float,
-        facecolor: str = '#CCCCCC',
-        edgecolor: str = 'black',
-        linewidth: float = 0.5,
-        zorder: int = 1
-    ):
-        """Draw a capsule (rounded rectangle with half-circle ends)."""
-        # Use FancyBboxPatch with round corners
-        rounding = min(height / 2, width / 2)
-        patch = FancyBboxPatch(
-            (x, y),
-            width,
-            height,
-            boxstyle=f"round,pad=0,rounding_size={rounding}",
-            facecolor=facecolor,
-            edgecolor=edgecolor,
-            linewidth=linewidth,
-            zorder=zorder
-        )
-        ax.add_patch(patch)
-        return patch
-
-    def _draw_segment(
-        self,
-        ax: plt.Axes,
-        x: float,
-        y: float,
-        width: float,
-        height: float,
-        color: str,
-        is_start: bool = False,
-        is_end: bool = False,
-        chrom_length_inch: float = 0,
-        zorder: int = 2
-    ):
-        """Draw a segment, with rounded ends if at chromosome boundaries."""
-        rounding = height / 2
-
-        if is_start and is_end:
-            # Entire chromosome is one segment - full capsule
-            patch = FancyBboxPatch(
-                (x, y),
-                width,
-                height,
-                boxstyle=f"round,pad=0,rounding_size={rounding}",
-                facecolor=color,
-                edgecolor='none',
-                zorder=zorder
-            )
-        elif is_start:
-            # Left end rounded
-            patch = FancyBboxPatch(
-                (x, y),
-                width + rounding,
-                height,
-                boxstyle=f"round,pad=0,rounding_size={rounding}",
-                facecolor=color,
-                edgecolor='none',
-                zorder=zorder,
-                clip_on=True
-            )
-            # Clip right side
-            clip_rect = Rectangle((x, y), width, height)
-            patch.set_clip_path(clip_rect, transform=ax.transData)
-        elif is_end:
-            # Right end rounded
-            patch = FancyBboxPatch(
-                (x - rounding, y),
-                width + rounding,
-                height,
-                boxstyle=f"round,pad=0,rounding_size={rounding}",
-                facecolor=color,
-                edgecolor='none',
-                zorder=zorder,
-                clip_on=True
-            )
-            # Clip left side
-            clip_rect = Rectangle((x, y), width, height)
-            patch.set_clip_path(clip_rect, transform=ax.transData)
-        else:
-            # Middle segment - rectangular
-            patch = Rectangle(
-                (x, y),
-                width,
-                height,
-                facecolor=color,
-                edgecolor='none',
-                zorder=zorder
-            )
-
-        ax.add_patch(patch)
-        return patch
+    def _origin_rgba_table(self) -> np.ndarray:
+        """
+        Return the (K, 4) RGBA palette indexed by karyotype origin id.
+        Built once per origin table; segment facecolors are gathered from it.
+        """
+        names = self.karyotype.origin_table.names
+        if len(self._palette) != len(names):
+            unknown = self.origins.get('unknown')
+            default = unknown.color if unknown else '#808080'
+            colors = [
+                self.origins[n].color if n in self.origins else default for n in names
+            ]
+            import matplotlib.colors as mcolors
+            self._palette = mcolors.to_rgba_array(colors).astype(np.float32).reshape(-1, 4)
+        return self._palette
 
     def _draw_scale_bar(self, ax: plt.Axes, y_pos: float):
         """Draw a scale bar at the bottom of the figure."""
@@ -714,55 +1169,68 @@ class ChromoMapRenderer:
         x_end = self.left_margin + self.plot_width
         ax.plot([x_start, x_end], [y_pos, y_pos], 'k-', linewidth=1, zorder=10)
 
-        # Draw ticks and labels
+        # Draw ticks and labels; integer multiples avoid float drift
         tick_height = 0.1
-        tick_val = 0
-        while tick_val <= max_val + 0.001:  # Small tolerance for float comparison
-            x = self.left_margin + (tick_val * scale_unit) * self.bp_to_inch
-            if x <= x_end + 0.01:
-                ax.plot([x, x], [y_pos, y_pos - tick_height], 'k-', linewidth=1, zorder=10)
-                # Format label nicely
-                if tick_val == int(tick_val):
-                    label = f"{int(tick_val)}"
-                else:
-                    label = f"{tick_val:g}"
-                ax.text(x, y_pos - tick_height - 0.1, label,
-                       ha='center', va='top', fontsize=9, zorder=10)
-            tick_val += tick_interval
+        num_ticks = int(np.floor(max_val / tick_interval + 1e-9)) + 1
+        tick_vals = np.arange(num_ticks) * tick_interval
+        xs = self.left_margin + tick_vals * scale_unit * self.bp_to_inch
+        keep = xs <= x_end + 0.01
+        tick_vals, xs = tick_vals[keep], xs[keep]
+
+        ax.vlines(xs, y_pos - tick_height, y_pos, colors='k', linewidth=1,
+                  capstyle='projecting', zorder=10)
+        for x, tick_val in zip(xs.tolist(), tick_vals.tolist()):
+            # Format label nicely
+            if tick_val == int(tick_val):
+                label = f"{int(tick_val)}"
+            else:
+                label = f"{tick_val:g}"
+            ax.text(x, y_pos - tick_height - 0.1, label,
+                   ha='center', va='top', fontsize=9, zorder=10)
 
         # Add unit label
         ax.text(x_end + 0.1, y_pos, unit_name, ha='left', va='center', fontsize=10, zorder=10)
 
+    def _legend_entries(self, used_origins: Sequence[str]) -> Tuple[List[mpatches.Patch], List[str]]:
+        """
+        Return legend (handles, labels) for the used origins that have colors.
+        Cached per origin list; legends copy handle properties, so the proxy
+        patches can be shared by every figure this renderer draws.
+        """
+        key = tuple(used_origins)
+        entries = self._legend_cache.get(key)
+        if entries is None:
+            import matplotlib.patches as mpatches
+            shown = [self.origins[name] for name in key if name in self.origins]
+            entries = (
+                [mpatches.Patch(facecolor=o.color, edgecolor='none') for o in shown],
+                [o.label for o in shown]
+            )
+            self._legend_cache[key] = entries
+        return entries
+
     def _draw_legend(
         self,
         ax: plt.Axes,
         position: str,
-        fig_height: float
+        fig_height: float,
+        used_origins: Optional[List[str]] = None
     ):
-        """Draw the legend."""
+        """
+        Draw the legend. Returns the Legend artist, or None.
+        used_origins lists the origins to show; computed from the karyotype if omitted.
+        """
         if position == 'none':
-            return
+            return None
 
-        # Get unique origins that are actually used
-        used_origins = set()
-        for chrom in self.karyotype.chromosomes.values():
-            for copy in chrom.copies.values():
-                for segment in copy.segments:
-                    used_origins.add(segment.origin)
-
-        # Create legend entries
-        handles = []
-        labels = []
-        for origin_name in sorted(used_origins):
-            if origin_name in self.origins:
-                origin = self.origins[origin_name]
-                handle = mpatches.Patch(facecolor=origin.color, edgecolor='none')
-                handles.append(handle)
-                labels.append(origin.label)
+        if used_origins is None:
+            used_origins = self.karyotype.used_origins()
 
+        handles, labels = self._legend_entries(used_origins)
         if not handles:
-            return
+            return None
 
+        legend = None
         if position == 'right':
             legend = ax.legend(
                 handles, labels,
@@ -782,6 +1250,26 @@ class ChromoMapRenderer:
                 fontsize=10,
                 title='Origin'
             )
+        return legend
+
+    def _output_bbox(self, fig: plt.Figure, ax: plt.Axes, legend) -> Bbox:
+        """
+        Compute the saved area in inches without a full tight-bbox pass.
+        The layout fills the figure except for the legend and text labels
+        (e.g. annotation labels above the top chromosome), so only those
+        extents are measured; segment collections are never traversed.
+        """
+        from matplotlib.transforms import Bbox
+
+        renderer = fig.canvas.get_renderer()
+        to_inches = fig.dpi_scale_trans.inverted()
+
+        boxes = [Bbox.from_extents(0, 0, self.fig_width, fig.get_figheight())]
+        artists = list(ax.texts) + ([legend] if legend is not None else [])
+        for artist in artists:
+            boxes.append(artist.get_window_extent(renderer).transformed(to_inches))
+
+        return Bbox.union(boxes).padded(0.1)
 
     def _calculate_jitter(
         self,
@@ -914,6 +1402,7 @@ class ChromoMapRenderer:
             y + self.marker_size * 0.3,
             label,
             fontsize=self.font_size - 2,
+            label='annotation-label',
             rotation=angle,
             ha='left',
             va='bottom',
@@ -966,16 +1455,55 @@ class ChromoMapRenderer:
 
     def render(
         self,
-        output_path: Path,
+        output_path: Union[Path, Sequence[Path]],
         sort_by: str = 'none',
         legend_position: str = 'right',
         show_scale: bool = True,
-        dpi: int = 300
+        dpi: int = 300,
+        fig: Optional[plt.Figure] = None
     ):
-        """Render the chromosome map to a file."""
+        """
+        Render the chromosome map to a file, or to each of several files
+        (e.g. PNG and PDF) from a single build of the figure.
+        If fig is given it is cleared and reused (and left open), which avoids
+        re-creating backend state when rendering many maps in a row.
+        """
+        output_paths = [output_path] if isinstance(output_path, (str, Path)) else output_path
+
+        owns_fig = fig is None
+        fig, bbox = self.build_figure(sort_by, legend_position, show_scale, fig)
+        for path in output_paths:
+            save_figure(fig, Path(path), bbox, dpi)
+
+        if owns_fig:
+            import matplotlib.pyplot as plt
+            plt.close(fig)
+
+    def build_figure(
+        self,
+        sort_by: str = 'none',
+        legend_position: str = 'right',
+        show_scale: bool = True,
+        fig: Optional[plt.Figure] = None
+    ) -> Tuple[plt.Figure, Bbox]:
+        """
+        Draw the chromosome map into a figure without saving it.
+        Returns (figure, bbox) where bbox is the area to save, in inches.
+        The figure can be saved any number of times with save_figure.
+        """
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import PathCollection, PolyCollection
+
         fig_height = self._calculate_fig_height(sort_by)
 
-        fig, ax = plt.subplots(figsize=(self.fig_width, fig_height))
+        if fig is None:
+            fig = plt.figure(figsize=(self.fig_width, fig_height))
+        else:
+            fig.clear()
+            fig.set_size_inches(self.fig_width, fig_height)
+
+        # Axes span the whole figure so data units are inches
+        ax = fig.add_axes([0, 0, 1, 1])
         ax.set_xlim(0, self.fig_width)
         ax.set_ylim(0, fig_height)
         ax.axis('off')
@@ -985,6 +1513,11 @@ class ChromoMapRenderer:
 
         chrom_names = self.karyotype.get_ordered_chromosomes(sort_by)
 
+        # Geometry is accumulated here and drawn as two collections below
+        outline_x1, outline_y = [], []
+        seg_x0, seg_x1, seg_y, seg_chrom_x1, seg_ids, seg_ordered = [], [], [], [], [], []
+        used_ids = []
+
         for i, chrom_name in enumerate(chrom_names):
             chrom = self.karyotype.chromosomes[chrom_name]
 
@@ -997,104 +1530,23 @@ class ChromoMapRenderer:
                 # Calculate y position for this copy
                 y = current_y - self.chrom_height
 
-                # Calculate chromosome length in inches
-                chrom_length_inch = copy.length * self.bp_to_inch
-
-                # Draw chromosome outline (capsule)
-                self._draw_capsule(
-                    ax,
-                    self.left_margin,
-                    y,
-                    chrom_length_inch,
-                    self.chrom_height,
-                    facecolor='#E0E0E0',
-                    edgecolor='#404040',
-                    linewidth=0.5,
-                    zorder=1
-                )
-
-                # Draw segments
-                rounding = self.chrom_height / 2
-
-                for seg_idx, segment in enumerate(copy.segments):
-                    seg_x = self.left_margin + segment.start * self.bp_to_inch
-                    seg_width = segment.length * self.bp_to_inch
-
-                    # Check if this is the start/end of chromosome
-                    is_start = (segment.start == 0)
-                    is_end = (segment.end >= copy.length - 1)
-
-                    # Get segment color
-                    color = self.origins.get(segment.origin, self.origins['unknown']).color
-
-                    # For proper rounded ends, draw as capsule if at edges
-                    if is_start and is_end:
-                        # Single segment covers entire chromosome - full capsule
-                        self._draw_capsule(
-                            ax, seg_x, y, seg_width, self.chrom_height,
-                            facecolor=color, edgecolor='none', zorder=2
-                        )
-                    elif is_start:
-                        # First segment - round left edge, flat right edge
-                        # Draw a full rounded box then cover right rounded part
-                        patch = FancyBboxPatch(
-                            (seg_x, y),
-                            seg_width + rounding,
-                            self.chrom_height,
-                            boxstyle=f"round,pad=0,rounding_size={rounding}",
-                            facecolor=color,
-                            edgecolor='none',
-                            zorder=2
-                        )
-                        ax.add_patch(patch)
-                        # Cover the right rounded part
-                        cover = Rectangle(
-                            (seg_x + seg_width, y),
-                            rounding,
-                            self.chrom_height,
-                            facecolor='#E0E0E0',
-                            edgecolor='none',
-                            zorder=1
-                        )
-                        ax.add_patch(cover)
-                    elif is_end:
-                        # Last segment - flat left edge, round right edge
-                        # Draw rectangle first, then add a rounded cap on the right
-                        # Main rectangle part
-                        rect = Rectangle(
-                            (seg_x, y),
-                            seg_width - rounding,
-                            self.chrom_height,
-                            facecolor=color,
-                            edgecolor='none',
-                            zorder=2
-                        )
-                        ax.add_patch(rect)
-                        # Right rounded cap (half circle)
-                        from matplotlib.patches import Arc, Wedge, Circle
-                        cap_center_x = seg_x + seg_width - rounding
-                        cap_center_y = y + self.chrom_height / 2
-                        # Use a wedge for the right semicircle
-                        cap = Wedge(
-                            (cap_center_x, cap_center_y),
-                            rounding,
-                            -90, 90,  # Right semicircle
-                            facecolor=color,
-                            edgecolor='none',
-                            zorder=2
-                        )
-                        ax.add_patch(cap)
-                    else:
-                        # Middle segment - plain rectangle
-                        patch = Rectangle(
-                            (seg_x, y),
-                            seg_width,
-                            self.chrom_height,
-                            facecolor=color,
-                            edgecolor='none',
-                            zorder=2
-                        )
-                        ax.add_patch(patch)
+                # Chromosome outline (capsule)
+                chrom_x1 = self.left_margin + copy.length * self.bp_to_inch
+                outline_x1.append(chrom_x1)
+                outline_y.append(y)
+
+                # Segments: the part of the outline capsule within each range
+                starts, ends, origin_ids = _merge_runs(copy.starts, copy.ends, copy.origin_ids)
+                seg_x0.append(self.left_margin + starts * self.bp_to_inch)
+                seg_x1.append(self.left_margin + ends * self.bp_to_inch)
+                seg_y.append(np.full(len(starts), y))
+                seg_chrom_x1.append(np.full(len(starts), chrom_x1))
+                seg_ids.append(origin_ids)
+                used_ids.append(copy.origin_ids)
+                # Segments are sorted by start, so any overlap shows up
+                # between neighbours; such copies must paint in that order
+                overlaps = bool((starts[1:] < ends[:-1]).any())
+                seg_ordered.append(np.full(len(starts), overlaps))
 
                 # Draw label
                 label = f"{chrom_name}-{copy_num}"
@@ -1105,6 +1557,7 @@ class ChromoMapRenderer:
                     ha='right',
                     va='center',
                     fontsize=self.font_size,
+                    label='chrom-label',
                     fontfamily='monospace'
                 )
 
@@ -1126,25 +1579,402 @@ class ChromoMapRenderer:
             if i < len(chrom_names) - 1:
                 current_y -= self.diff_chrom_spacing
 
+        # Draw chromosome outlines and segments as polygon collections.
+        # Axis limits are fixed, so skip the per-path data-limit pass.
+        if outline_y:
+            outline_x0 = np.full(len(outline_y), self.left_margin)
+            outline_verts = _capsule_vertices(
+                outline_x0, outline_x1, outline_y, self.chrom_height
+            )
+            ax.add_collection(PolyCollection(
+                outline_verts,
+                facecolors='#E0E0E0',
+                edgecolors='#404040',
+                linewidths=0.5,
+                zorder=1
+            ), autolim=False)
+
+        seg_ids = np.concatenate(seg_ids) if seg_ids else np.empty(0, dtype=np.int32)
+        if len(seg_ids):
+            seg_x0 = np.concatenate(seg_x0)
+            seg_x1 = np.concatenate(seg_x1)
+            seg_y = np.concatenate(seg_y)
+            seg_chrom_x1 = np.concatenate(seg_chrom_x1)
+            ordered = np.concatenate(seg_ordered)
+            rgba = self._origin_rgba_table()
+            collections = []
+
+            # Copies with overlapping segments (e.g. an introgression drawn
+            # over a background) keep their sorted order, later on top
+            if ordered.any():
+                collections.append(PolyCollection(
+                    _capsule_vertices(
+                        np.full(ordered.sum(), self.left_margin), seg_chrom_x1[ordered],
+                        seg_y[ordered], self.chrom_height,
+                        clip_x0=seg_x0[ordered], clip_x1=seg_x1[ordered]
+                    ),
+                    facecolors=rgba[seg_ids[ordered]],
+                    edgecolors='none',
+                    zorder=2
+                ))
+
+            # Elsewhere no two segments overlap and paint order is free.
+            # Only segments reaching into a rounded end need the capsule
+            # template; all others are plain 4-vertex rectangles.
+            # Antialiasing and path.simplify stay at their defaults: Agg
+            # never simplifies closed polygons, and filling them
+            # is a small share of a PNG save next to encoding.
+            cap_radius = np.minimum(
+                self.chrom_height / 2, (seg_chrom_x1 - self.left_margin) / 2
+            )
+            capped = ((seg_x0 < self.left_margin + cap_radius)
+                      | (seg_x1 > seg_chrom_x1 - cap_radius)) & ~ordered
+
+            rect = ~capped & ~ordered
+            rect_verts = _rect_vertices(
+                seg_x0[rect], seg_x1[rect], seg_y[rect], self.chrom_height
+            )
+            capsule_verts = _capsule_vertices(
+                np.full(capped.sum(), self.left_margin), seg_chrom_x1[capped],
+                seg_y[capped], self.chrom_height,
+                clip_x0=seg_x0[capped], clip_x1=seg_x1[capped]
+            )
+
+            # One compound path per origin keeps the collection at a handful
+            # of Path objects however many segments there are; this paints
+            # in origin-id order, which is safe only without overlaps
+            if not ordered.all():
+                paths, path_ids = _compound_paths([
+                    (rect_verts, seg_ids[rect]), (capsule_verts, seg_ids[capped])
+                ])
+                collections.append(PathCollection(
+                    paths,
+                    facecolors=rgba[path_ids],
+                    edgecolors='none',
+                    zorder=2
+                ))
+
+            for segments in collections:
+                # Dense maps embed the segment layer in PDF/SVG as one image;
+                # Agg (PNG) output ignores this flag
+                if 0 < self.rasterize_threshold < len(seg_ids):
+                    segments.set_rasterized(True)
+                ax.add_collection(segments, autolim=False)
+
         # Draw scale bar
         if show_scale:
             scale_y = self.bottom_margin * 0.6
             self._draw_scale_bar(ax, scale_y)
 
-        # Draw legend
-        self._draw_legend(ax, legend_position, fig_height)
+        # Draw legend from the origin ids gathered before merging
+        legend = None
+        if legend_position != 'none':
+            used_ids = np.concatenate(used_ids) if used_ids else np.empty(0, dtype=np.int32)
+            used_origins = self.karyotype.origin_table.used_names(used_ids)
+            legend = self._draw_legend(ax, legend_position, fig_height, used_origins)
 
-        # Save figure
-        plt.tight_layout()
+        return fig, self._output_bbox(fig, ax, legend)
 
-        suffix = output_path.suffix.lower()
-        if suffix == '.svg':
-            plt.savefig(output_path, format='svg', bbox_inches='tight')
-        elif suffix == '.pdf':
-            plt.savefig(output_path, format='pdf', bbox_inches='tight')
-        else:
-            plt.savefig(output_path, format='png', dpi=dpi, bbox_inches='tight')
+    def update_style(
+        self,
+        fig: plt.Figure,
+        legend_position: str = 'right',
+        font_size: Optional[float] = None
+    ) -> Bbox:
+        """
+        Restyle a figure from build_figure in place: redraw the legend at
+        legend_position and, if given, set the label font size. Chromosomes
+        and segments are left as they are. Returns the new bbox to save.
+        """
+        ax = fig.axes[0]
+
+        if font_size is not None:
+            self.font_size = font_size
+            for text in ax.texts:
+                if text.get_label() == 'chrom-label':
+                    text.set_fontsize(font_size)
+                elif text.get_label() == 'annotation-label':
+                    text.set_fontsize(font_size - 2)
+
+        legend = ax.get_legend()
+        if legend is not None:
+            legend.remove()
+        legend = self._draw_legend(ax, legend_position, fig.get_figheight())
+
+        return self._output_bbox(fig, ax, legend)
+
+
+# zlib level for PNG output: 1 is much faster than the default 6 for
+# large rasters, at the cost of somewhat bigger files
+PNG_COMPRESS_LEVEL = 1
 
+
+def save_figure(fig: plt.Figure, output_path: Path, bbox: Bbox, dpi: int = 300):
+    """
+    Save a built figure; the format follows the file suffix (PNG by default).
+    Vector outputs are written without a creation date stamp; dpi sets the
+    resolution of any rasterized layer in them.
+    """
+    suffix = output_path.suffix.lower()
+    if suffix == '.svg':
+        fig.savefig(output_path, format='svg', dpi=dpi, bbox_inches=bbox,
+                    metadata={'Date': None})
+    elif suffix == '.pdf':
+        fig.savefig(output_path, format='pdf', dpi=dpi, bbox_inches=bbox,
+                    metadata={'CreationDate': None})
+    else:
+        fig.savefig(output_path, format='png', dpi=dpi, bbox_inches=bbox,
+                    pil_kwargs={'compress_level': PNG_COMPRESS_LEVEL})
+
+
+# =============================================================================
+# Batch Rendering
+# =============================================================================
+
+@dataclass
+class BatchJob:
+    """Input files and output path for one map in a batch."""
+    karyotype: Path
+    segments: Path
+    out: Path
+    colors: Optional[Path] = None
+    annotations: Optional[Path] = None
+
+
+def parse_batch_file(filepath: Path) -> List[BatchJob]:
+    """
+    Parse batch manifest TSV file.
+    Format: #karyotype  segments  out  [colors]  [annotations]
+
+    Relative paths are resolved against the manifest's directory.
+    Use '-' (or leave empty) for optional columns that are not provided.
+    """
+    base = Path(filepath).parent
+    line_nums, rows = _read_table(
+        filepath, 3, 'Batch', 'karyotype, segments, out, [colors], [annotations]'
+    )
+
+    def resolve(parts: List[str], i: int) -> Optional[Path]:
+        value = parts[i].strip() if len(parts) > i else ''
+        if not value or value == '-':
+            return None
+        return base / value
+
+    jobs = []
+    for line_num, parts in zip(line_nums, rows):
+        for i, name in enumerate(('karyotype', 'segments', 'out')):
+            if resolve(parts, i) is None:
+                raise ValueError(f"Batch file line {line_num}: missing {name} path")
+        jobs.append(BatchJob(
+            karyotype=resolve(parts, 0),
+            segments=resolve(parts, 1),
+            out=resolve(parts, 2),
+            colors=resolve(parts, 3),
+            annotations=resolve(parts, 4)
+        ))
+
+    return jobs
+
+
+# Figure reused by every job rendered in this process (see _render_one)
+_batch_figure: Optional[plt.Figure] = None
+
+
+def _render_one(
+    job: BatchJob,
+    renderer_kwargs: Dict[str, Any],
+    render_kwargs: Dict[str, Any],
+    use_cache: bool = False
+) -> Path:
+    """
+    Parse and render one batch job. Runs inside a worker process.
+    Errors are re-raised naming the job's output and segments file.
+    """
+    global _batch_figure
+    try:
+        loader = load_inputs_cached if use_cache else load_inputs
+        karyo, origins, annotations = loader(
+            job.karyotype, job.segments, job.colors, job.annotations
+        )
+        renderer = ChromoMapRenderer(
+            karyotype=karyo,
+            origins=origins,
+            annotations=annotations,
+            **renderer_kwargs
+        )
+        if _batch_figure is None:
+            import matplotlib.pyplot as plt
+            _batch_figure = plt.figure()
+        renderer.render(output_path=job.out, fig=_batch_figure, **render_kwargs)
+    except Exception as e:
+        raise ValueError(f"Batch job {job.out} (segments {job.segments}): {e}") from e
+    return job.out
+
+
+def render_batch(
+    jobs: Sequence[BatchJob],
+    renderer_kwargs: Optional[Dict[str, Any]] = None,
+    render_kwargs: Optional[Dict[str, Any]] = None,
+    max_workers: Optional[int] = None,
+    use_cache: bool = False
+) -> List[Path]:
+    """
+    Render many maps in parallel, one process per job.
+    Jobs are independent, so parsing and rendering scale with CPU count.
+    Returns the output paths in job order.
+    """
+    worker = partial(
+        _render_one,
+        renderer_kwargs=renderer_kwargs or {},
+        render_kwargs=render_kwargs or {},
+        use_cache=use_cache
+    )
+    if max_workers == 1 or len(jobs) <= 1:
+        global _batch_figure
+        try:
+            return [worker(job) for job in jobs]
+        finally:
+            if _batch_figure is not None:
+                import matplotlib.pyplot as plt
+                plt.close(_batch_figure)
+                _batch_figure = None
+
+    # Fork on Linux: workers inherit the imported modules. Elsewhere keep the
+    # platform default, as fork is unsafe on macOS once system frameworks load
+    context = None
+    if sys.platform.startswith('linux'):
+        context = multiprocessing.get_context('fork')
+
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+        return list(executor.map(worker, jobs))
+
+
+# =============================================================================
+# Serve Mode
+# =============================================================================
+
+# Style options a serve request may change; everything else is fixed at startup
+SERVE_STYLE_OPTIONS = (
+    'out', 'sort', 'legend', 'no_scale', 'width', 'chrom_height', 'font_size',
+    'dpi', 'marker_size', 'label_angle', 'no_labels', 'rasterize_threshold'
+)
+
+# Number of built figures kept in memory by serve_requests()
+_SERVE_CACHE_SIZE = 4
+
+
+def split_style(style: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Split CLI style options into (renderer_kwargs, render_kwargs)."""
+    renderer_kwargs = dict(
+        fig_width=style['width'],
+        chrom_height=style['chrom_height'],
+        font_size=style['font_size'],
+        marker_size=style['marker_size'],
+        label_angle=style['label_angle'],
+        show_labels=not style['no_labels'],
+        rasterize_threshold=style['rasterize_threshold']
+    )
+    render_kwargs = dict(
+        sort_by=style['sort'],
+        legend_position=style['legend'],
+        show_scale=not style['no_scale'],
+        dpi=style['dpi']
+    )
+    return renderer_kwargs, render_kwargs
+
+
+def _parse_serve_request(line: str, params: Dict[str, click.Parameter]) -> Dict[str, Any]:
+    """
+    Parse one serve request line of whitespace-separated key=value pairs.
+    Keys are CLI option names (e.g. out=a.png sort=length no-scale=true);
+    values are converted and checked with the CLI option types, and out
+    may be repeated like -o.
+    """
+    request = {}
+    for token in line.split():
+        key, sep, value = token.partition('=')
+        name = key.lstrip('-').replace('-', '_')
+        if not sep or name not in SERVE_STYLE_OPTIONS:
+            raise ValueError(f"invalid request item '{token}'")
+        param = params[name]
+        value = param.type.convert(value, param, None)
+        request[name] = request.get(name, ()) + (value,) if param.multiple else value
+    return request
+
+
+def serve_requests(
+    input_paths: Tuple[Path, Path, Optional[Path], Optional[Path]],
+    style: Dict[str, Any],
+    params: Dict[str, click.Parameter],
+    stream: IO[str],
+    use_cache: bool = False
+):
+    """
+    Answer render requests read line by line from stream until EOF or 'quit'.
+    Parsed inputs stay in memory and are reloaded only when an input file
+    changes (by mtime and size). Built figures are cached by style, so a
+    request that only changes out or dpi is just another savefig, and one
+    that only changes legend or font-size restyles the cached figure.
+    """
+    import matplotlib.pyplot as plt
+
+    loader = load_inputs_cached if use_cache else load_inputs
+    input_keys = None
+    inputs = None
+    figures: OrderedDict[Tuple, Tuple[ChromoMapRenderer, plt.Figure, Bbox, str]] = OrderedDict()
+
+    click.echo("Ready. Send key=value options per line (e.g. out=map.png sort=length), 'quit' to stop.")
+    for line in stream:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if line in ('quit', 'exit'):
+            break
+
+        try:
+            request_style = dict(style, **_parse_serve_request(line, params))
+
+            keys = tuple(_file_key(p) for p in input_paths)
+            if keys != input_keys:
+                inputs = loader(*input_paths)
+                input_keys = keys
+                for _, fig, _, _ in figures.values():
+                    plt.close(fig)
+                figures.clear()
+
+            renderer_kwargs, render_kwargs = split_style(request_style)
+            dpi = render_kwargs.pop('dpi')
+            legend_position = render_kwargs.pop('legend_position')
+            font_size = renderer_kwargs.pop('font_size')
+            fig_key = tuple(sorted(renderer_kwargs.items())) + tuple(sorted(render_kwargs.items()))
+
+            if fig_key in figures:
+                figures.move_to_end(fig_key)
+                renderer, fig, bbox, shown_legend = figures[fig_key]
+                if (legend_position, font_size) != (shown_legend, renderer.font_size):
+                    bbox = renderer.update_style(fig, legend_position, font_size)
+            else:
+                karyo, origins, annotations = inputs
+                renderer = ChromoMapRenderer(
+                    karyotype=karyo,
+                    origins=origins,
+                    annotations=annotations,
+                    font_size=font_size,
+                    **renderer_kwargs
+                )
+                fig, bbox = renderer.build_figure(legend_position=legend_position, **render_kwargs)
+                if len(figures) >= _SERVE_CACHE_SIZE:
+                    plt.close(figures.popitem(last=False)[1][1])
+            figures[fig_key] = (renderer, fig, bbox, legend_position)
+
+            for path in request_style['out']:
+                save_figure(fig, path, bbox, dpi)
+                click.echo(f"Saved {path}")
+
+        except (ValueError, OSError, click.ClickException) as e:
+            click.echo(f"Error: {e}", err=True)
+
+    for _, fig, _, _ in figures.values():
         plt.close(fig)
 
 
@@ -1155,15 +1985,17 @@ class ChromoMapRenderer:
 @click.command()
 @click.option(
     '-k', '--karyotype',
-    required=True,
+    required=False,
+    default=None,
     type=click.Path(exists=True, path_type=Path),
-    help='Karyotype definition file (TSV)'
+    help='Karyotype definition file (TSV). Required unless --batch is given.'
 )
 @click.option(
     '-s', '--segments',
-    required=True,
+    required=False,
+    default=None,
     type=click.Path(exists=True, path_type=Path),
-    help='Segment origins file (TSV)'
+    help='Segment origins file (TSV). Required unless --batch is given.'
 )
 @click.option(
     '-c', '--colors',
@@ -1174,9 +2006,10 @@ class ChromoMapRenderer:
 )
 @click.option(
     '-o', '--out',
-    default='out.png',
+    default=['out.png'],
+    multiple=True,
     type=click.Path(path_type=Path),
-    help='Output file path (SVG/PNG/PDF)'
+    help='Output file path (SVG/PNG/PDF); repeat to save one render in several files'
 )
 @click.option(
     '--sort',
@@ -1218,7 +2051,7 @@ class ChromoMapRenderer:
     '--dpi',
     type=int,
     default=300,
-    help='PNG output resolution'
+    help='PNG output resolution (also used for rasterized segments in PDF/SVG)'
 )
 @click.option(
     '-a', '--annotations',
@@ -1245,11 +2078,42 @@ class ChromoMapRenderer:
     default=False,
     help='Hide annotation labels (show only markers)'
 )
+@click.option(
+    '--rasterize-threshold',
+    type=click.IntRange(min=0),
+    default=5000,
+    help='Rasterize segments in PDF/SVG output above this many segments (0 = never)'
+)
+@click.option(
+    '--batch',
+    required=False,
+    default=None,
+    type=click.Path(exists=True, path_type=Path),
+    help='Batch manifest (TSV: karyotype, segments, out, [colors], [annotations])'
+)
+@click.option(
+    '-j', '--jobs',
+    type=click.IntRange(min=1),
+    default=None,
+    help='Parallel worker processes for --batch (default: all CPUs)'
+)
+@click.option(
+    '--cache',
+    is_flag=True,
+    default=False,
+    help='Reuse parsed inputs from ~/.cache/hybridchromomap while input files are unchanged'
+)
+@click.option(
+    '--serve',
+    is_flag=True,
+    default=False,
+    help='Keep inputs loaded and render key=value style requests read from stdin'
+)
 def main(
-    karyotype: Path,
-    segments: Path,
+    karyotype: Optional[Path],
+    segments: Optional[Path],
     colors: Optional[Path],
-    out: Path,
+    out: Tuple[Path, ...],
     sort: str,
     legend: str,
     no_scale: bool,
@@ -1260,7 +2124,12 @@ def main(
     annotations: Optional[Path],
     marker_size: float,
     label_angle: float,
-    no_labels: bool
+    no_labels: bool,
+    rasterize_threshold: int,
+    batch: Optional[Path],
+    jobs: Optional[int],
+    cache: bool,
+    serve: bool
 ):
     """
     HybridChromoMap - Chromosome ancestry painting visualization
@@ -1271,60 +2140,54 @@ def main(
     If no colors file is provided (-c), chromosomes will be auto-colored
     with each chromosome getting a distinct color.
     """
+    if batch is None and (karyotype is None or segments is None):
+        raise click.UsageError("--karyotype and --segments are required unless --batch is given")
+
+    if batch is not None and serve:
+        raise click.UsageError("--batch and --serve cannot be combined")
+
+    # Output only goes to files: select Agg before pyplot is first imported,
+    # so no GUI toolkit is probed or loaded (PDF/SVG saves switch canvas)
+    import matplotlib
+    matplotlib.use('Agg')
+
+    ctx = click.get_current_context()
+    style = {name: ctx.params[name] for name in SERVE_STYLE_OPTIONS}
+    renderer_kwargs, render_kwargs = split_style(style)
+
     try:
-        # Parse input files
-        click.echo(f"Loading karyotype from {karyotype}...")
-        karyo = parse_karyotype(karyotype)
-
-        click.echo(f"Loading segments from {segments}...")
-        parse_segments(segments, karyo)
-
-        # Handle colors
-        if colors is not None:
-            click.echo(f"Loading colors from {colors}...")
-            origin_dict = parse_origins(colors)
-
-            # Validate that segment origins match colors file
-            errors = validate_data(karyo, origin_dict)
-            if errors:
-                click.echo("Validation errors:", err=True)
-                for error in errors:
-                    click.echo(f"  - {error}", err=True)
-                sys.exit(1)
-        else:
-            click.echo("No colors file provided, auto-generating colors for origins...")
-            # Generate colors based on unique origins in segments
-            origin_dict = generate_origin_colors(karyo)
+        if serve:
+            params = {param.name: param for param in ctx.command.params}
+            input_paths = (karyotype, segments, colors, annotations)
+            serve_requests(input_paths, style, params, sys.stdin, cache)
+            return
 
-        # Handle annotations
-        annot_list = []
-        if annotations is not None:
-            click.echo(f"Loading annotations from {annotations}...")
-            annot_list = parse_annotations(annotations, karyo)
-            click.echo(f"  Loaded {len(annot_list)} annotations")
+        if batch is not None:
+            batch_jobs = parse_batch_file(batch)
+            click.echo(f"Rendering {len(batch_jobs)} maps from {batch}...")
+            for path in render_batch(batch_jobs, renderer_kwargs, render_kwargs, jobs, cache):
+                click.echo(f"  Saved {path}")
+            click.echo("Done!")
+            return
+
+        # Parse input files
+        loader = load_inputs_cached if cache else load_inputs
+        karyo, origin_dict, annot_list = loader(
+            karyotype, segments, colors, annotations, echo=click.echo
+        )
 
         # Render
-        click.echo(f"Rendering to {out}...")
+        out_list = ', '.join(str(p) for p in out)
+        click.echo(f"Rendering to {out_list}...")
         renderer = ChromoMapRenderer(
             karyotype=karyo,
             origins=origin_dict,
             annotations=annot_list,
-            fig_width=width,
-            chrom_height=chrom_height,
-            font_size=font_size,
-            marker_size=marker_size,
-            label_angle=label_angle,
-            show_labels=not no_labels
-        )
-        renderer.render(
-            output_path=out,
-            sort_by=sort,
-            legend_position=legend,
-            show_scale=not no_scale,
-            dpi=dpi
+            **renderer_kwargs
         )
+        renderer.render(output_path=out, **render_kwargs)
 
-        click.echo(f"Done! Output saved to {out}")
+        click.echo(f"Done! Output saved to {out_list}")
 
     except Exception as e:
         click.echo(f"Error: {e}", err=True)